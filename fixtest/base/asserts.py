@@ -9,15 +9,48 @@ import os
 import sys
 
 
+# Sentinel used to detect missing tags with a single lookup
+_MISSING = object()
+
+# Caches the base file name for each code object seen by _loc()
+_BASENAME_CACHE = {}
+
+# Caches the base file name for each file path, so that code objects
+# from the same file share the same string
+_FNAME_INTERN = {}
+
+
+def _basename(path):
+    """ Returns os.path.basename(path), caching the result. """
+    name = _FNAME_INTERN.get(path)
+    if name is None:
+        name = os.path.basename(path)
+        _FNAME_INTERN[path] = name
+    return name
+
+
+def _loc(frame):
+    """ Returns a (file name, line number) tuple for the frame.
+
+        The base file name is cached per code object, so repeated
+        assertions from the same caller do not reparse the path.
+    """
+    code = frame.f_code
+    name = _BASENAME_CACHE.get(code)
+    if name is None:
+        name = _basename(code.co_filename)
+        _BASENAME_CACHE[code] = name
+    return name, frame.f_lineno
+
+
 def assert_equals(condition_a, condition_b):
     """ Assert that both sides are equal """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition_a != condition_b:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} != {3}, expected equal at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition_a,
                 condition_b))
 
@@ -25,12 +58,11 @@ def assert_equals(condition_a, condition_b):
 def assert_not_equals(condition_a, condition_b):
     """ Assert that the sides are not equal """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition_a == condition_b:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} == {3}, expected not equal at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition_a,
                 condition_b))
 
@@ -38,80 +70,75 @@ def assert_not_equals(condition_a, condition_b):
 def assert_is_none(condition):
     """ Assert the condition is None """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition is not None:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} is not None, expected None at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition))
 
 
 def assert_is_not_none(condition):
     """ Assert the condition is not None """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition is None:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} is None, expected not None at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition))
 
 
 def assert_true(condition):
     """ Assert the condition is True """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition is not True:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} is not True, expected True at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition))
 
 
 def assert_false(condition):
     """ Assert the condition is False """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     if condition is True:
+        caller = sys._getframe(1)
         raise AssertionError(
             '{2} is True, expected False at {0} line {1}'.format(
-                os.path.basename(caller.f_code.co_filename),
-                caller.f_lineno,
+                *_loc(caller),
                 condition))
 
 
 def assert_tag_exists(message, tags):
     """ Check to see that the tags exist in the message """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     for tag in tags:
         if tag not in message:
+            caller = sys._getframe(1)
             raise AssertionError(
                 '{2} not in message at {0} line {1}'.format(
-                    os.path.basename(caller.f_code.co_filename),
-                    caller.f_lineno,
+                    *_loc(caller),
                     tag))
 
 
 def assert_tag(message, tags):
     """ Check to see that the tag and values are in the message """
     # pylint: disable=protected-access, consider-using-f-string
-    caller = sys._getframe(1)
     for tag in tags:
-        if tag[0] not in message:
+        value = message.get(tag[0], _MISSING)
+        if value is _MISSING:
+            caller = sys._getframe(1)
             raise AssertionError(
                 '{2} not in message at {0} line {1}'.format(
-                    os.path.basename(caller.f_code.co_filename),
-                    caller.f_lineno,
+                    *_loc(caller),
                     tag[0]))
-        if tag[1] != message[tag[0]]:
+        if tag[1] != value:
+            caller = sys._getframe(1)
             raise AssertionError(
                 'message[{2}] is {3}, expected {4} at {0} line {1}'.format(
-                    os.path.basename(caller.f_code.co_filename),
-                    caller.f_lineno,
+                    *_loc(caller),
                     tag[0],
-                    message[tag[0]],
+                    value,
                     tag[1]))
@@ -28,17 +28,46 @@
 
 """
 
-import copy
-import runpy
 import pathlib
 
 
+# Compiled config files, indexed by (file name, modification time)
+_CODE_CACHE = {}
+
+# Leaf types that are immutable and can be shared between copies
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def _fast_clone(obj):
+    """ Returns a deep copy of a configuration object.
+
+        Configurations are normally made up of dicts, lists, tuples
+        and scalars, so these are copied directly.  Anything else
+        falls back to copy.deepcopy().
+    """
+    if isinstance(obj, dict):
+        return {k: _fast_clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_fast_clone(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_fast_clone(v) for v in obj)
+    if isinstance(obj, _IMMUTABLE_TYPES):
+        return obj
+
+    # pylint: disable=import-outside-toplevel
+    from copy import deepcopy
+    return deepcopy(obj)
+
+
 class Config:
     """ Base class for all configuration objects.  Usually the
         derived classes will setup the self._config dict().
     """
+    __slots__ = ('_config', '_link_index')
+
     def __init__(self):
         self._config = {}
+        self._link_index = None
 
     def get_role(self, role_name):
         """ Returns the configuration for the given role.
@@ -48,7 +77,7 @@ class Config:
 
             Returns: A dict() that contains the configuration for the node.
         """
-        return copy.deepcopy(self._config['ROLES'][role_name])
+        return _fast_clone(self._config['ROLES'][role_name])
 
     def get_link(self, client_role, server_role, protocol_name='FIX'):
         """ Returns the configuration for the given link.
@@ -68,13 +97,32 @@ class Config:
 
             Raises: ValueError
         """
+        if self._link_index is None:
+            self._link_index = self._build_link_index()
+
+        connection = self._link_index.get(
+            (client_role, server_role, protocol_name))
+        if connection is None:
+            raise KeyError("Cannot find a matching configuration")
+        return _fast_clone(connection)
+
+    def _build_link_index(self):
+        """ Builds the (client_role, server_role, protocol) index
+            used by get_link().
+
+            Every key in a connection may be used as the client role,
+            the first matching connection wins.
+        """
+        index = {}
         for connection in self._config['CONNECTIONS']:
-            if (client_role in connection and
-                    server_role in connection and
-                    connection['protocol'] == protocol_name and
-                    connection['acts-as-server'] == server_role):
-                return copy.deepcopy(connection)
-        raise KeyError("Cannot find a matching configuration")
+            server_role = connection['acts-as-server']
+            if server_role not in connection:
+                continue
+            for client_role in connection:
+                index.setdefault(
+                    (client_role, server_role, connection['protocol']),
+                    connection)
+        return index
 
     def get_section(self, section_name):
         """ Returns the configuration section.
@@ -82,7 +130,7 @@ class Config:
             Args:
                 section_name:
         """
-        return copy.deepcopy(self._config[section_name])
+        return _fast_clone(self._config[section_name])
 
     def update(self, new_entries):
         """ Update the configuration with new data.
@@ -91,11 +139,13 @@ class Config:
                 new_entries: The new data to add/update.
         """
         self._config.update(new_entries)
+        self._link_index = None
 
 
 class FileConfig(Config):
     """ Provide the configuration from a file.
     """
+    __slots__ = ()
 
     def __init__(self, file_name):
         """ Initialize from the given fileName
@@ -105,10 +155,19 @@ class FileConfig(Config):
         """
         super().__init__()
 
-        if not pathlib.Path(file_name).is_file():
+        path = pathlib.Path(file_name)
+        if not path.is_file():
             raise FileNotFoundError(file_name)
 
-        new_globals = runpy.run_path(file_name, globals())
+        # The file is only compiled again if it has been modified
+        key = (str(file_name), path.stat().st_mtime_ns)
+        code = _CODE_CACHE.get(key)
+        if code is None:
+            code = compile(path.read_bytes(), str(file_name), 'exec')
+            _CODE_CACHE[key] = code
+
+        new_globals = {'__name__': '<run_path>', '__file__': str(file_name)}
+        exec(code, new_globals)  # pylint: disable=exec-used
 
         self._config['CONNECTIONS'] = new_globals.get('CONNECTIONS')
         self._config['ROLES'] = new_globals.get('ROLES')
@@ -119,6 +178,8 @@ class FileConfig(Config):
 class DictConfig(Config):
     """ Provide the configuration from a pre-existing dictionary.
     """
+    __slots__ = ()
+
     def __init__(self, initial_config):
         """ Dictionary-based configuration
 
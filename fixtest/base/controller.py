@@ -6,6 +6,7 @@
 """
 
 import logging
+import threading
 import time
 
 from twisted.internet import reactor
@@ -25,6 +26,10 @@ class TestCaseController:
             exit_value: The value returned when exiting from the
                 command line.
     """
+    __slots__ = ('testcase_id', 'description', 'test_status', 'exit_value',
+                 '_is_cancelled', '_connect_events', '_endpoint_cache',
+                 '_logger')
+
     def __init__(self, **kwargs):
         """ TestCaseController initialization
 
@@ -40,6 +45,13 @@ class TestCaseController:
 
         self._is_cancelled = False
 
+        # Set (indexed by client name) when a client connection attempt
+        # has completed, successfully or not
+        self._connect_events = {}
+
+        # Client endpoints, indexed by (host, port)
+        self._endpoint_cache = {}
+
         self._logger = logging.getLogger(__name__)
 
     def servers(self):
@@ -76,11 +88,11 @@ class TestCaseController:
             self.test_status = 'ok'
             self.exit_value = 0
         except AssertionError as err:
-            self.test_status = 'fail: assert failed : ' + str(err)
+            self.test_status = f'fail: assert failed : {err}'
         except FixtestTestInterruptedError:
             self.test_status = 'fail: test cancelled'
         except FixtestTimeoutError as err:
-            self.test_status = 'fail: timeout : ' + str(err)
+            self.test_status = f'fail: timeout : {err}'
         except Exception:
             self.test_status = 'fail: exception'
             self._logger.exception('fail: exception')
@@ -141,8 +153,7 @@ class TestCaseController:
                      client['host'],
                      client['port']))
 
-        str_send = f"tcp:{client['host']}:{client['port']}:timeout=10"
-        endpoint = clientFromString(reactor, str_send)
+        endpoint = self._endpoint_for(client['host'], client['port'])
 
         node = client['node']
         deferred = connectProtocol(endpoint, node)
@@ -150,6 +161,28 @@ class TestCaseController:
                               callbackArgs=(client,),
                               errback=node.client_failure,
                               errbackArgs=(client,))
+        deferred.addBoth(self._mark_connected, client['name'])
+
+    def _endpoint_for(self, host, port):
+        """ Returns the client endpoint for host:port.  Endpoints are
+            cached so that reconnecting does not parse the endpoint
+            description again.
+        """
+        key = (host, port)
+        endpoint = self._endpoint_cache.get(key)
+        if endpoint is None:
+            endpoint = clientFromString(reactor,
+                                        f"tcp:{host}:{port}:timeout=10")
+            self._endpoint_cache[key] = endpoint
+        return endpoint
+
+    def _mark_connected(self, result, name):
+        """ Deferred callback, signals the thread waiting in
+            wait_for_client_connections() that the connection attempt
+            for the client has completed.
+        """
+        self._connect_events[name].set()
+        return result
 
     def wait_for_client_connections(self, timeout):
         """ Initiate and wait for all client connections to connect.
@@ -161,28 +194,27 @@ class TestCaseController:
                 FixtestTimeoutError
                 FixtestTestInterruptedError
         """
-        for client in self.clients().values():
+        clients = list(self.clients().values())
+        for client in clients:
+            self._connect_events[client['name']] = threading.Event()
             reactor.callFromThread(self._start_client, client)
 
         # Now have to wait until all clients are connected
-        per_sec = 5
-        success = True
-        for _ in range(timeout * per_sec):
-            if self._is_cancelled:
-                raise FixtestTestInterruptedError('test cancelled')
-
-            success = True
-            for client in self.clients().values():
-                if client.get('error', None) is not None:
-                    raise client['error']
-                if client.get('connected', '') == '':
-                    success = False
+        deadline = time.monotonic() + timeout
+        for client in clients:
+            event = self._connect_events[client['name']]
+            while True:
+                if self._is_cancelled:
+                    raise FixtestTestInterruptedError('test cancelled')
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise FixtestTimeoutError(
+                        'waiting for clients to connect')
+                # Cap the wait so that cancellation is noticed promptly
+                if event.wait(min(remaining, 0.5)):
                     break
-            if success:
-                break
-            time.sleep(1.0/per_sec)
-        if not success:
-            raise FixtestTimeoutError('waiting for clients to connect')
+            if client.get('error', None) is not None:
+                raise client['error']
 
     def wait_for_server_connections(self, timeout):
         """ Wait for all server connections to connect.
@@ -191,21 +223,23 @@ class TestCaseController:
                 FixtestTestInterruptedError
                 FixtestTimeoutError
         """
+        # Only the servers that have not connected yet are checked
+        pending = list(self.servers().values())
         per_sec = 5
         for _ in range(timeout * per_sec):
             if self._is_cancelled:
                 raise FixtestTestInterruptedError('test cancelled')
 
-            success = True
-            for server in self.servers().values():
+            still_pending = []
+            for server in pending:
                 if server.get('error', None) is not None:
                     raise server['error']
                 if len(server['factory'].servers) == 0:
-                    success = False
-                    break
-            if success:
+                    still_pending.append(server)
+            pending = still_pending
+            if not pending:
                 break
             time.sleep(1.0/per_sec)
 
-        if not success:
+        if pending:
             raise FixtestTimeoutError("waitng for servers to connect")
@@ -5,10 +5,8 @@
 
 """
 
-import collections
 
-
-class BasicMessage(collections.abc.MutableMapping):
+class BasicMessage(dict):
     """ A BasicMessage is just a collection of (ID, VALUE) pairs.
 
         All IDs are converted into strings, this allows users of the
@@ -18,7 +16,14 @@ class BasicMessage(collections.abc.MutableMapping):
         If you iterate through the BasicMessage, the items will be
         returned in the order they were added.  This is important
         because the order of the fields is important to FIX.
+
+        This is a dict() subclass, so the methods that are not
+        key-based (iteration, len(), equality, ...) are the builtin
+        dict() versions.  The key-based methods are overridden so that
+        the keys go through __keytransform__().
     """
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         """ Initialization
 
@@ -27,27 +32,53 @@ class BasicMessage(collections.abc.MutableMapping):
                     merge with this.  This can be a list of (ID, VALUE)
                     tuples or a BasicMessage().
         """
-        self.store = collections.OrderedDict()
+        super().__init__()
 
         if 'source' in kwargs:
             self.update(kwargs['source'])
 
     def __getitem__(self, key):
-        return self.store[self.__keytransform__(key)]
+        return dict.__getitem__(self, self.__keytransform__(key))
 
     def __setitem__(self, key, value):
-        self.store[self.__keytransform__(key)] = value
+        dict.__setitem__(self, self.__keytransform__(key), value)
 
     def __delitem__(self, key):
-        del self.store[self.__keytransform__(key)]
+        dict.__delitem__(self, self.__keytransform__(key))
+
+    def __contains__(self, key):
+        return dict.__contains__(self, self.__keytransform__(key))
 
-    def __iter__(self):
-        return iter(self.store)
+    def get(self, key, default=None):
+        return dict.get(self, self.__keytransform__(key), default)
 
-    def __len__(self):
-        return len(self.store)
+    def pop(self, key, *args):
+        return dict.pop(self, self.__keytransform__(key), *args)
+
+    def setdefault(self, key, default=None):
+        return dict.setdefault(self, self.__keytransform__(key), default)
+
+    def update(self, *args, **kwargs):
+        """ Adds the fields from a mapping or an iterable of
+            (ID, VALUE) pairs.  Any existing fields are overwritten.
+        """
+        # pylint: disable=arguments-differ, unidiomatic-typecheck
+        if args:
+            source = args[0]
+            if type(source) is type(self):
+                # The keys have already been transformed
+                dict.update(self, source)
+            else:
+                if hasattr(source, 'keys'):
+                    source = source.items()
+                transform = self.__keytransform__
+                dict.update(self, ((transform(key), value)
+                                   for key, value in source))
+        if kwargs:
+            self.update(kwargs)
 
     def __keytransform__(self, key):
         """ Override this to enforce the type of key expected.
         """
-        return str(key)
+        # pylint: disable=unidiomatic-typecheck
+        return key if type(key) is str else str(key)
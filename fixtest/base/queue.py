@@ -5,9 +5,9 @@
 
 """
 
-import datetime
 import logging
 import queue
+import time
 
 from fixtest.base import FixtestTimeoutError, FixtestTestInterruptedError
 
@@ -57,19 +57,19 @@ class MessageQueue(queue.Queue):
                 FixtestTimeoutError:
                 TestInterruptedError
         """
-        start = datetime.datetime.now()
-        message = None
+        deadline = time.monotonic() + timeout
 
-        while message is None:
-            if (datetime.datetime.now() - start).seconds > timeout:
-                raise FixtestTimeoutError(f'message timeout: {title}')
+        while True:
             if self._is_cancelled:
                 raise FixtestTestInterruptedError('test cancelled')
 
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FixtestTimeoutError(f'message timeout: {title}')
+
             try:
-                message = self.get(True, timeout=1.0)
+                # Cap the wait so that cancellation is noticed promptly
+                return self.get(True, timeout=min(remaining, 0.5))
             except queue.Empty:
                 # if empty keep on cycling
                 pass
-
-        return message
@@ -7,21 +7,15 @@
 
 import argparse
 import datetime
-import importlib
+import importlib.util
 import inspect
 import logging
 import logging.config
 import os
 import signal
 import sys
-import threading
-
-from twisted.internet import reactor
-from twisted.internet.endpoints import serverFromString
-from twisted.python import log
 
 from fixtest import VERSION_STRING
-from fixtest.base.controller import TestCaseController
 from fixtest.base.config import FileConfig
 from fixtest.base.utils import log_text
 
@@ -50,6 +44,12 @@ def _parse_command_line_args():
         help='enable debug output',
         action='store_true',
         default=False)
+    parser.add_argument(
+        '--asyncio',
+        help='run Twisted on top of the asyncio event loop ' +
+             '(uses uvloop if it is installed)',
+        action='store_true',
+        default=False)
     parser.add_argument(
         'args',
         help='Additional arguments will be passed onto the TestCaseController',
@@ -87,6 +87,26 @@ def _setup_logging_config():
     })
 
 
+def _install_asyncio_reactor():
+    """ Installs the Twisted reactor that runs on top of an asyncio
+        event loop.  The uvloop event loop is used if it is available,
+        otherwise the default asyncio event loop.
+
+        This must be called before the reactor is imported.
+    """
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+    from twisted.internet import asyncioreactor
+
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    asyncioreactor.install(loop)
+
+
 def _find_controller(module_name):
     """ Looks up the module and then looks for the TestController
         instance within the module.
@@ -96,6 +116,9 @@ def _find_controller(module_name):
                 be a TestController-derived class within this module.
                 Only the first one will be loaded and run.
     """
+    # pylint: disable=import-outside-toplevel
+    from fixtest.base.controller import TestCaseController
+
     if not os.path.isfile(module_name):
         print(f"Cannot find the file:{module_name}")
         sys.exit(2)
@@ -107,7 +130,13 @@ def _find_controller(module_name):
     module_path = module_name.replace('/', '.')
     if module_path.endswith('.py'):
         module_path = module_path[:-3]
-    module = importlib.import_module(module_path)
+
+    # Load straight from the file, rather than searching sys.path
+    # for the module
+    spec = importlib.util.spec_from_file_location(module_path, module_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_path] = module
+    spec.loader.exec_module(module)
 
     cls = None
 
@@ -143,32 +172,17 @@ def main():
     """ Main entrypoint for the tool.  This will be called from the
         command-line script.
     """
-    # pylint: disable=protected-access
+    # pylint: disable=protected-access,import-outside-toplevel
     _setup_logging_config()
     logger = logging.getLogger(__name__)
 
-    test_thread = None
-    controller = None
-
     def term_signal_handler(num, frame):
-        """ The signal-handler for the Twisted reactor.
-            We assume that all signals are to shutdown the reactor and cancel
-            the running tests.
+        """ The signal-handler for the signals that the Twisted reactor
+            does not handle itself.  These shutdown the reactor, the
+            running test is cancelled by the shutdown trigger.
         """
         # pylint: disable=unused-argument
-        if controller is not None:
-            controller.cancel_test()
-
-        # The actual stop gets called in the finally portion
-        # of the run loop.
-        # reactor.callInThread(reactor.stop)
-
-    def start_test_thread(call_function):
-        """ This will be called on the reactor thread to start up the
-            testcase thread.
-        """
-        test_thread = threading.Thread(target=call_function)
-        test_thread.start()
+        reactor.callFromThread(reactor.stop)
 
     # If there's only a single argument asking for the version
     # exit out without going through argparse
@@ -182,6 +196,14 @@ def main():
         print(f"{sys.argv[0]}, version {VERSION_STRING}")
         sys.exit(0)
 
+    # Twisted is only imported once we know that a test will be run,
+    # so that --version and argument errors return quickly
+    if arg_results.asyncio is True:
+        _install_asyncio_reactor()
+    from twisted.internet import reactor
+    from twisted.internet.endpoints import serverFromString
+    from twisted.python import log
+
     if arg_results.debug is True:
         logger.setLevel(logging.DEBUG)
 
@@ -226,14 +248,16 @@ def main():
                               errback=factory.server_failure,
                               errbackArgs=(server,))
 
-    for sig in [signal.SIGINT, signal.SIGHUP, signal.SIGTERM, signal.SIGQUIT]:
+    # The reactor installs its own SIGINT/SIGTERM handlers when it
+    # runs, which stop the reactor, so cancel the test on shutdown
+    reactor.addSystemEventTrigger('before', 'shutdown', controller.cancel_test)
+    for sig in [signal.SIGHUP, signal.SIGQUIT]:
         signal.signal(sig, term_signal_handler)
 
-    reactor.callWhenRunning(start_test_thread, controller._execute_test)
-    reactor.run()
-
-    if test_thread is not None:
-        test_thread.join()
+    # The test runs on a thread from the reactor's pool, which is joined
+    # when the reactor shuts down.  The test stops the reactor when done.
+    reactor.callWhenRunning(reactor.callInThread, controller._execute_test)
+    reactor.run(installSignalHandlers=True)
 
     log_text(logger.info, None, '================')
     log_text(logger.info, None,
@@ -6,11 +6,25 @@
 """
 
 import datetime
+import logging
+
+
+# Maps the Logger method names onto their logging levels
+_METHOD_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'exception': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
 
 
 def current_timestamp():
-    """Return the current time as a string"""
-    return datetime.datetime.now().strftime("%H:%M:%S.%f")
+    """Return the current time as a string (HH:MM:SS.ffffff)"""
+    now = datetime.datetime.now()
+    return (f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+            f".{now.microsecond:06d}")
 
 
 def format_log_line(header, text):
@@ -21,6 +35,26 @@ def format_log_line(header, text):
     return f"{current_timestamp()}: {header}: {text}"
 
 
+def _is_enabled(log):
+    """ Returns False if log is a bound Logger method (such as
+        logger.debug) whose level is disabled, True otherwise.
+    """
+    logger = getattr(log, '__self__', None)
+    if not isinstance(logger, (logging.Logger, logging.LoggerAdapter)):
+        return True
+    level = _METHOD_LEVELS.get(log.__name__)
+    return level is None or logger.isEnabledFor(level)
+
+
 def log_text(log, header, text):
-    """Write out the name/text to the specified log object"""
+    """ Write out the name/text to the specified log object.
+
+        If log is a Logger method whose level is disabled, nothing
+        is formatted.  The text may also be a callable, which is only
+        called if the line is actually written.
+    """
+    if not _is_enabled(log):
+        return
+    if callable(text):
+        text = text()
     log(format_log_line(header, text))
@@ -199,19 +199,37 @@ class FIX:
         'N': 'Released',
     }
 
+    # Values read from the wire may be bytes, so also index the maps
+    # by the encoded keys.  str(b'D') would give "b'D'".
+    _msgtype_map.update({k.encode('ascii'): v
+                         for k, v in _msgtype_map.items()})
+    _exectype_map.update({k.encode('ascii'): v
+                          for k, v in _exectype_map.items()})
+
+    @staticmethod
+    def _lookup(table, key):
+        """ Looks up the key (a string or bytes) in one of the maps.
+            Any other key is only converted into a string if it is not
+            found as-is.
+        """
+        name = table.get(key)
+        if name is None and not isinstance(key, (str, bytes)):
+            name = table.get(str(key))
+        return '???' if name is None else name
+
     @staticmethod
     def find_msgtype(key):
         """ Maps the message type constant used in the protocol
             to a descriptive string.
 
         Args:
-            key: A string that is a value (in the FIX protocol).
+            key: A string (or bytes) that is a value (in the FIX protocol).
 
         Returns:
             Returns a string that contains the more descriptive string.
             If the value does not exist, '???' is returned.
         """
-        return FIX._msgtype_map.get(str(key), '???')
+        return FIX._lookup(FIX._msgtype_map, key)
 
     @staticmethod
     def find_exectype(key):
@@ -219,10 +237,10 @@ class FIX:
             to a descriptive string.
 
         Args:
-            key: A string that is a value (in the FIX protocol).
+            key: A string (or bytes) that is a value (in the FIX protocol).
 
         Returns:
             Returns a string that contains the more descriptive string.
             If the value does not exist, '???' is returned.
         """
-        return FIX._exectype_map.get(str(key), '???')
+        return FIX._lookup(FIX._exectype_map, key)
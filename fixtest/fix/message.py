@@ -5,36 +5,100 @@
 
 """
 
-from io import BytesIO
+import functools
+import itertools
+import zlib
 
 from fixtest.base.message import BasicMessage
 
 
+# The largest chunk whose byte sum (at most 255 per byte) cannot
+# overflow the adler32 modulus, see checksum()
+_ADLER_CHUNK = 256
+
+# Repeating groups are stored as a list (or tuple) of dicts.  The
+# exact type is checked, which is cheaper than isinstance()
+_GROUP_TYPES = frozenset((list, tuple))
+
+# The header fields that a message starts with
+_DEFAULT_HEADER = (8, 9, 35, 49, 56)
+
+# Marks a missing tag in verify()
+_MISSING = object()
+
+# Fields that to_binary() writes itself rather than from the body
+_HEADER_EXCLUDE = frozenset((8, 9, 10))
+
+# The checksum is one of only 256 values, so the formatted field
+# value and the complete "10=NNN\x01" field are precomputed
+_CHECKSUM_STR = tuple(f'{i:03d}' for i in range(256))
+_CHECKSUM_TAG = tuple(f'10={i:03d}\x01'.encode('ascii') for i in range(256))
+
+
 def checksum(data, starting_checksum=0):
     """ Calculates the checksum of the binary message according to FIX.
 
         This does not do any filtering of the data, so do not
         calculate this with field 10 included.
     """
-    chksum = starting_checksum
-    for bval in data:
-        chksum = (chksum + bval) % 256
-
-    return chksum
+    # The FIX checksum is the sum of the bytes mod 256.  The byte sums
+    # come from zlib.adler32(), whose low 16 bits are
+    # 1 + (sum of the bytes) mod 65521.  That is the exact sum as long
+    # as the chunk is small enough, and is much faster than sum().
+    if len(data) <= _ADLER_CHUNK:
+        return (starting_checksum + (zlib.adler32(data) & 0xFFFF) - 1) & 0xFF
+
+    # Larger messages are summed a chunk at a time
+    view = memoryview(data)
+    total = starting_checksum
+    for i in range(0, len(view), _ADLER_CHUNK):
+        total += (zlib.adler32(view[i:i + _ADLER_CHUNK]) & 0xFFFF) - 1
+    return total & 0xFF
+
+
+@functools.lru_cache(maxsize=1024)
+def _tag_prefix(tag):
+    """ Returns the encoded "tag=" prefix for a field.
+
+        Tags come from a small, fixed set so the result is cached.
+    """
+    return f"{tag}=".encode('ascii')
 
 
 def _single_field(tag, value):
     """ Returns a byte string in the form of "tag=value\x01"
+
+        Binary values (bytes or bytearray) are written as-is, anything
+        else is converted with str().
+    """
+    # Most values are already strings, so skip the str() call for them
+    # pylint: disable=unidiomatic-typecheck
+    if type(value) is str:
+        value = value.encode('latin-1')
+    elif not isinstance(value, (bytes, bytearray)):
+        value = str(value).encode('latin-1')
+    return b''.join((_tag_prefix(tag), value, b'\x01'))
+
+
+@functools.lru_cache(maxsize=16)
+def _begin_string_field(value):
+    """ Returns the encoded BeginString (8) field and its checksum.
+
+        A session sends the same BeginString on every message, so
+        the result is cached.
     """
-    iobuf = BytesIO()
+    field = _single_field(8, value)
+    return field, checksum(field)
 
-    iobuf.write(str.encode(f"{tag}="))
-    if isinstance(value, bytes):
-        iobuf.write(value)
-    else:
-        iobuf.write(str(value).encode('latin-1'))
-    iobuf.write(b'\x01')
-    return iobuf.getvalue()
+
+@functools.lru_cache(maxsize=16)
+def _header_template(header):
+    """ Returns a dict with empty values for the header tags, used to
+        initialize new messages.  The parser creates a message for
+        every message received, always with the same header, so this
+        is cached.
+    """
+    return dict.fromkeys((int(tag) for tag in header), '')
 
 
 def _write_single_field(output, tag, value):
@@ -44,29 +108,48 @@ def _write_single_field(output, tag, value):
         key is a numeric string, that is only digits are allowed.
 
         Args:
-            output:
+            output: The bytearray the field is appended to.
             tag:
             value:
     """
-    output.write(_single_field(tag, value))
+    output.extend(_single_field(tag, value))
 
 
 def _write_field(output, tag, value):
     """ Writes a field to the output. The value may be hiearchical.
 
         Args:
-            output:
+            output: The bytearray the field is appended to.
             tag: The ID portion.
-            value: The value portion.  This may be a nested group.
+            value: The value portion.  This may be a nested group,
+                a list (or tuple) of dicts.
     """
-    if isinstance(value, list):
-        # write out the number of subgroups
-        _write_single_field(output, tag, len(value))
-        for subgroup in value:
-            for key, val in subgroup.items():
-                _write_field(output, key, val)
-    else:
+    if type(value) not in _GROUP_TYPES:
         _write_single_field(output, tag, value)
+        return
+
+    # Nested groups are walked with an explicit stack of iterators
+    # over the (tag, value) pairs of each group, rather than by recursion
+    _write_single_field(output, tag, len(value))
+    stack = [_group_items(value)]
+    while stack:
+        for key, val in stack[-1]:
+            if type(val) in _GROUP_TYPES:
+                # write out the number of subgroups, then descend
+                _write_single_field(output, key, len(val))
+                stack.append(_group_items(val))
+                break
+            _write_single_field(output, key, val)
+        else:
+            stack.pop()
+
+
+def _group_items(group):
+    """ Returns an iterator over the (tag, value) pairs of all of the
+        subgroups in a group, in order.
+    """
+    return itertools.chain.from_iterable(
+        subgroup.items() for subgroup in group)
 
 
 class FIXMessage(BasicMessage):
@@ -79,7 +162,16 @@ class FIXMessage(BasicMessage):
 
         A FIX field is composed of (tag, value) pairs.  A tag is a
         numeric positive integer field.  The value is a string.
+
+        The MsgType (35) value is always stored as a string, bytes
+        values are decoded when they are set.
+
+        The output of to_binary() is cached until the message is
+        modified, so resending an unchanged message does not serialize
+        it again.  Messages that contain groups are not cached, since
+        the groups may be modified in place.
     """
+    __slots__ = ('_wire',)
 
     def __init__(self, **kwargs):
         """ Initialization
@@ -97,31 +189,91 @@ class FIXMessage(BasicMessage):
                     This setting only affects to_binary(), the input order
                     is not validated here.
         """
+        # The cached to_binary() output, None if the message
+        # has been modified since then
+        self._wire = None
+
         super().__init__()
 
         # Preinsert header fields
-        header = kwargs.get('header_fields', [8, 9, 35, 49, 56])
-        for tag in header:
-            self[tag] = ''
+        header = kwargs.get('header_fields', _DEFAULT_HEADER)
+        dict.update(self, _header_template(tuple(header)))
 
         if 'source' in kwargs:
             self.update(kwargs['source'])
 
+    # The key-based lookups convert the key inline rather than through
+    # __keytransform__(), they are used for nearly every field access.
+    # pylint: disable=unidiomatic-typecheck
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, key if type(key) is int else int(key))
+
+    def __contains__(self, key):
+        return dict.__contains__(self,
+                                 key if type(key) is int else int(key))
+
+    def get(self, key, default=None):
+        return dict.get(self, key if type(key) is int else int(key), default)
+
+    def __setitem__(self, key, value):
+        self._wire = None
+        if type(key) is not int:
+            key = int(key)
+        if key == 35 and isinstance(value, bytes):
+            value = value.decode()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._wire = None
+        BasicMessage.__delitem__(self, key)
+
+    def pop(self, key, *args):
+        self._wire = None
+        return BasicMessage.pop(self, key, *args)
+
+    def popitem(self):
+        self._wire = None
+        return BasicMessage.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._wire = None
+        key = self.__keytransform__(key)
+        if key == 35 and isinstance(default, bytes):
+            default = default.decode()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._wire = None
+        BasicMessage.update(self, *args, **kwargs)
+        self._decode_msg_type()
+
+    def _decode_msg_type(self):
+        """ Decodes a bytes MsgType (35) that was stored without going
+            through __setitem__().
+        """
+        value = dict.get(self, 35)
+        if isinstance(value, bytes):
+            dict.__setitem__(self, 35, value.decode())
+
+    def clear(self):
+        self._wire = None
+        BasicMessage.clear(self)
+
     def __keytransform__(self, key):
         """ Override this to enforce the type of key expected.
 
             FIX only expects purely numeric keys.
         """
-        return int(key)
+        # pylint: disable=unidiomatic-typecheck
+        return key if type(key) is int else int(key)
 
     def msg_type(self):
         """ Returns the MessageType field (tag 35) of the message.
 
             Returns: a string containing the value of the tag 35 field.
         """
-        if isinstance(self[35], bytes):
-            return self[35].decode()
-        return self[35]
+        return dict.__getitem__(self, 35)
 
     def to_binary(self, **kwargs):
         """ Converts the message into the on-the-wire format.
@@ -141,38 +293,56 @@ class FIXMessage(BasicMessage):
                 A binary string containing the message in the
                 FIX on-the-wire format.
         """
-        includes = {int(k): True for k in kwargs['include']} \
-            if 'include' in kwargs else {}
-        excludes = {int(k): True for k in kwargs['exclude']} \
-            if 'exclude' in kwargs else {}
+        if not kwargs and self._wire is not None:
+            return self._wire
 
-        output = BytesIO()
+        # The body is generated without the header fields, so the
+        # excluded tags are merged into a single set up front
+        skip = _HEADER_EXCLUDE
+        if kwargs.get('exclude'):
+            skip = skip.union(int(k) for k in kwargs['exclude'])
 
-        for key, val in self.items():
-            if len(includes) > 0 and key not in includes:
-                continue
-            if len(excludes) > 0 and key in excludes:
-                continue
+        items = self.items()
+        if kwargs.get('include'):
+            includes = frozenset(int(k) for k in kwargs['include'])
+            items = [item for item in items if item[0] in includes]
+
+        output = bytearray()
+        has_groups = False
 
-            # Generate the binary without these fields
-            if key in {8, 9, 10}:
+        for key, val in items:
+            if key in skip:
                 continue
 
             # write a field out, this may be a grouped value
+            if type(val) in _GROUP_TYPES:
+                has_groups = True
             _write_field(output, key, val)
 
-        mess = output.getvalue()
-
         # prepend 8 (BeginString) and 9 (BodyLength)
         # Note that 8 and 9 are the minimal set of required fields
-        self[9] = str(len(mess))
-        mess = _single_field(8, self[8]) + _single_field(9, self[9]) + mess
-
-        # calc and append the 10 (CheckSum)
+        begin_string = self[8]
+        if isinstance(begin_string, (str, bytes)):
+            begin_field, chksum = _begin_string_field(begin_string)
+        else:
+            begin_field = _single_field(8, begin_string)
+            chksum = checksum(begin_field)
+        self[9] = str(len(output))
+        length_field = _single_field(9, self[9])
+
+        # calc and append the 10 (CheckSum), the pieces are only
+        # joined once at the end
         if 10 in self:
             del self[10]
-        self[10] = f'{checksum(mess):03d}'
-        return mess + _single_field(10, self[10])
+        chksum = checksum(output, checksum(length_field, chksum))
+        self[10] = _CHECKSUM_STR[chksum]
+        mess = b''.join((begin_field, length_field, output,
+                         _CHECKSUM_TAG[chksum]))
+
+        # Messages generated with include/exclude are not cached
+        if not kwargs and not has_groups:
+            self._wire = mess
+        return mess
 
     def verify(self, fields=None, exists=None, not_exists=None):
         """ Checks for the existence/value of tags/values.
@@ -191,22 +361,17 @@ class FIXMessage(BasicMessage):
                 False otherwise.
         """
 
-        fields = fields or []
-        exists = exists or []
-        not_exists = not_exists or []
-
-        for field in fields:
-            if field[0] not in self:
-                return False
-
-            if self[field[0]] != field[1]:
+        # A single lookup per field, the sentinel cannot compare
+        # equal to any expected value
+        for tag, value in fields or ():
+            if self.get(tag, _MISSING) != value:
                 return False
 
-        for tag in exists:
+        for tag in exists or ():
             if tag not in self:
                 return False
 
-        for tag in not_exists:
+        for tag in not_exists or ():
             if tag in self:
                 return False
 
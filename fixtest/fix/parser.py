@@ -5,15 +5,26 @@
 
 """
 
-import collections
 import logging
 
 from fixtest.base.utils import log_text
 from fixtest.fix.message import FIXMessage, checksum
 
 
+# These fields are not counted in the BodyLength (9)
+_LENGTH_EXCLUDE = frozenset((8, 9, 10))
+
+# Maps the tag id bytes seen on the wire to their int value.  A stream
+# only uses a small set of tags, a dict lookup is much cheaper than
+# int() on bytes.  The size is capped in case of junk input.
+_TAG_IDS = {}
+_TAG_IDS_MAX = 4096
+
+
 class FIXParserError(ValueError):
     """ Exception: FIX Message is not in proper FIX format. """
+    __slots__ = ('message',)
+
     def __init__(self, message):
         super().__init__()
         self.message = message
@@ -24,6 +35,8 @@ class FIXParserError(ValueError):
 
 class FIXLengthTooLongError(ValueError):
     """ Exception: FIX message too long. """
+    __slots__ = ('message',)
+
     def __init__(self, message):
         super().__init__()
         self.message = message
@@ -32,6 +45,26 @@ class FIXLengthTooLongError(ValueError):
         return self.message
 
 
+class _GroupLevel:
+    """ The state of a repeating group that is being parsed.
+
+        Attributes:
+            tag_id: The group ID field.
+            members: The set of tags that belong to the group.
+            list: The list of groups read in so far.
+            group: The current group (a dict), None if no fields
+                have been read in yet.
+    """
+    # pylint: disable=too-few-public-methods
+    __slots__ = ('tag_id', 'members', 'list', 'group')
+
+    def __init__(self, tag_id, members):
+        self.tag_id = tag_id
+        self.members = members
+        self.list = []
+        self.group = None
+
+
 class FIXParser:
     """ Implements the core decoding of FIX messages.  The encoding
         portion is taken up by the FIXMessage itself.
@@ -54,6 +87,12 @@ class FIXParser:
                 processing a current buffer.
     """
     # pylint: disable=too-many-instance-attributes
+    __slots__ = ('is_parsing', 'is_receiving_data',
+                 '_receiver', '_header_fields', '_binary_fields',
+                 '_group_fields', '_max_length', '_debug', '_buffer',
+                 '_pos', '_scan_pos', '_batch',
+                 '_message', '_header_length',
+                 '_binary_length', '_binary_tag', '_level_stack', '_logger')
 
     def __init__(self, receiver, **kwargs):
         """ FIXParser initialization
@@ -64,6 +103,8 @@ class FIXParser:
                     callbacks:
                         on_message_received(message)
                         on_error_received(error)
+                    In batch mode, the receiver must also implement
+                        on_messages_received(messages)
                 header_fields: A list of header tags.  This only affects
                     the sending of the message. The order of the input
                     fields is not validated.
@@ -82,22 +123,52 @@ class FIXParser:
                 max_length: Maximum length of a FIX message supported
                     (Default: 2048).
                 debug: Set to True for more debugging output
+                batch_callbacks: Set to True to pass all of the messages
+                    parsed from a buffer to on_messages_received() as a
+                    list of (message, length, checksum) tuples, rather than
+                    calling on_message_received() for each message.
+                    (Default: False)
         """
         self.is_parsing = False
 
         self._receiver = receiver
-        self._header_fields = kwargs.get('header_fields', [8, 9, 35, 49, 56])
-        self._binary_fields = kwargs.get('binary_fields', [])
-        self._group_fields = kwargs.get('group_fields', [])
+        # Kept as a tuple, FIXMessage uses it (without a copy) as the key
+        # for its cached header template on every new message
+        self._header_fields = tuple(
+            kwargs.get('header_fields') or (8, 9, 35, 49, 56))
+        self._binary_fields = frozenset(kwargs.get('binary_fields') or ())
+        # The member tags of each group are kept as sets, they are
+        # checked for every field within a group
+        self._group_fields = {
+            tag: frozenset(members)
+            for tag, members in (kwargs.get('group_fields') or {}).items()}
         self._max_length = kwargs.get('max_length', 2048)
         self._debug = kwargs.get('debug', False)
 
-        self._buffer = b''
+        # Received data that has not been parsed yet, preceded by the
+        # fields already parsed from the current message.  The message
+        # length and checksum are taken from the buffer once the whole
+        # message is in.  Parsed data is deleted from the front after
+        # each pass, which CPython does in place.
+        self._buffer = bytearray()
         self.is_receiving_data = False
 
+        # The position of the first unparsed field in the buffer
+        self._pos = 0
+
+        # The buffer has no SOH before this position (used when only
+        # part of a field has been received)
+        self._scan_pos = 0
+
+        # Messages waiting to be passed to the receiver, None if
+        # each message is passed on as soon as it is parsed
+        self._batch = [] if kwargs.get('batch_callbacks', False) else None
+
         self._message = FIXMessage(header_fields=self._header_fields)
-        self._checksum = 0
-        self._message_length = 0
+
+        # The size of the 8 and 9 fields, which are not counted in the
+        # message length
+        self._header_length = 0
 
         # used for binary field processing
         self._binary_length = -1
@@ -114,8 +185,7 @@ class FIXParser:
         """
         self.is_parsing = False
         self._message = FIXMessage(header_fields=self._header_fields)
-        self._checksum = 0
-        self._message_length = 0
+        self._header_length = 0
 
         # used for binary field processing
         self._binary_length = -1
@@ -124,8 +194,12 @@ class FIXParser:
         # used for groups processing
         self._level_stack = []
 
+        # the binary state has changed, so rescan the whole buffer
+        self._scan_pos = 0
+
         if flush_buffer:
-            self._buffer = b''
+            self._buffer.clear()
+            self._pos = 0
 
     def _parse_field(self, buf):
         """ Parses the 'id=value' field.  id must be a number.
@@ -137,33 +211,22 @@ class FIXParser:
                 FIXParserError
         """
 
-        delim = buf.find(b'=')
-        if delim == -1:
+        # partition() splits in a single C call
+        tag, delim, value = buf.partition(b'=')
+        if not delim:
             raise FIXParserError('Incorrect format: missing "="')
 
-        tag_id = 0
-        try:
-            tag_id = int(buf[:delim])
-        except ValueError as err:
-            raise FIXParserError(f'Incorrect format: ID:{str(buf[:delim])}') \
-                from err
-
-        return (tag_id, buf[delim+1:])
-
-    def _update_length(self, field, tag_id, value):
-        """ Update the message length calculations """
-        # pylint: disable=unused-argument
-        if tag_id not in {8, 9, 10}:
-            self._message_length += len(field) + 1
-        if self._message_length >= self._max_length:
-            raise FIXLengthTooLongError(
-                f'message too long: {self._message_length}')
-
-    def _update_checksum(self, field, tag_id, value):
-        """ Update the message checksum calculations """
-        # pylint: disable=unused-argument
-        if tag_id != 10:
-            self._checksum = checksum(field, self._checksum) + 1
+        tag_id = _TAG_IDS.get(tag)
+        if tag_id is None:
+            try:
+                tag_id = int(tag)
+            except ValueError as err:
+                raise FIXParserError(f'Incorrect format: ID:{str(tag)}') \
+                    from err
+            if len(_TAG_IDS) < _TAG_IDS_MAX:
+                _TAG_IDS[tag] = tag_id
+
+        return (tag_id, value)
 
     def _update_binary(self, field, tag_id, value):
         """ Update the binary field processing internals """
@@ -191,6 +254,15 @@ class FIXParser:
             self._binary_tag = 0
             self._binary_length = -1
 
+    def _set_field(self, tag_id, value):
+        """ Sets a field at the top level of the message.  This is all
+            that _update_field() does when the parser has no groups.
+        """
+        if isinstance(value, bytes):
+            self._message[tag_id] = value.decode()
+        else:
+            self._message[tag_id] = value
+
     def _update_field(self, tag_id, value):
         """ Update the value of the field
             If the value is a bytestring, it will be converted
@@ -202,51 +274,46 @@ class FIXParser:
         if tag_id in self._group_fields:
             # start a new level, an individual group doesn't
             # exist since we haven't read any information in yet.
-            self._level_stack.append({
-                'tag_id': tag_id,
-                'list': [],
-                'group': None,
-                })
-
-        elif len(self._level_stack) == 0:
-            # We are at the top of the message
-            if isinstance(value, bytes):
-                self._message[tag_id] = value.decode()
-            else:
-                self._message[tag_id] = value
-
-        elif tag_id in self._group_fields[self._level_stack[-1]['tag_id']]:
-            # We are within a group and the field is in the list of tags
-            # for this group
-            level = self._level_stack[-1]
-            group = level['group']
-            if group is None or tag_id in group:
-                # Create a new group if there is no current group
-                # or if this key already exists within the group
-                group = collections.OrderedDict()
-                level['list'].append(group)
-                level['group'] = group
-            group[tag_id] = value
+            self._level_stack.append(
+                _GroupLevel(tag_id, self._group_fields[tag_id]))
+            return
 
-        else:
+        if (len(self._level_stack) > 0 and
+                tag_id not in self._level_stack[-1].members):
             # we are in a grouping, but we have a tag_id that doesn't
-            # belong, so need to pop the stack off
+            # belong, so need to pop the stack off until we are at a
+            # level that it belongs to (or at the top of the message)
             level = self._level_stack.pop()  # this is the current level
 
             while len(self._level_stack) > 0:
                 # Add the current group to it's parent grouping
                 parent_level = self._level_stack[-1]
-                parent_level['group'][level['tag_id']] = level['list']
+                parent_level.group[level.tag_id] = level.list
 
                 level = parent_level
-                if tag_id in self._group_fields[level['tag_id']]:
+                if tag_id in level.members:
                     break
                 self._level_stack.pop()
 
             if len(self._level_stack) == 0:
-                self._message[level['tag_id']] = level['list']
+                self._message[level.tag_id] = level.list
 
-            self._update_field(tag_id, value)
+        if len(self._level_stack) == 0:
+            # We are at the top of the message
+            self._set_field(tag_id, value)
+            return
+
+        # We are within a group and the field is in the list of tags
+        # for this group
+        level = self._level_stack[-1]
+        group = level.group
+        if group is None or tag_id in group:
+            # Create a new group if there is no current group
+            # or if this key already exists within the group
+            group = {}
+            level.list.append(group)
+            level.group = group
+        group[tag_id] = value
 
     def on_data_received(self, data):
         """ Passes data to the parser.
@@ -259,41 +326,99 @@ class FIXParser:
                 data: The binary data that has been received.  This may
                     either be a binary string or a single byte ot data.
         """
-        # pylint: disable=too-many-branches,too-many-statements
-
         if self.is_receiving_data is True:
-            self._buffer += data
+            # Called from a receiver callback, the data is parsed by
+            # the outer call.  A callback that keeps adding data faster
+            # than it can be parsed would grow the buffer without limit,
+            # so this fails the outer call instead.
+            unparsed = len(self._buffer) - self._pos + len(data)
+            if unparsed > self._max_length * 2:
+                raise FIXLengthTooLongError(
+                    f'receive buffer too long: {unparsed}')
+            self._buffer.extend(data)
             return
 
         try:
             self.is_receiving_data = True
-            self._buffer += data
-
-            # Keep looping while we have unprocessed data
-            # We start processing only once we have an entire field
-            # (e.g. 'id=value') in the buffer, otherwise wait for more
-            # data.
-            # The problem with the current approach is that if there is a
-            # binary field with an incorrect length, we may read past
-            # the end of the message.
-            # BUGBUG: Need to fix this. A quick hack may be to
-            # try to peek to see what the tag id is and do something
-            # with that.  On the other hand this may just be a problem
-            # with the protocol (should probably specify a maximum
-            # allowable length of a binary field as a sanity check)
-            while (len(self._buffer) > 0 and
-                    self._buffer.find(b'\x01', self._binary_length + 1) != -1):
+            self._buffer.extend(data)
+
+            # Parse, then hand over any batched messages.  Data received
+            # during the batch callback is parsed on the next pass.
+            while True:
+                self._parse_buffer()
+                if not self._batch:
+                    break
+                self._deliver_batch()
+
+        except FIXLengthTooLongError as err:
+            self._deliver_batch()
+            self.reset(flush_buffer=True)
+            self._receiver.on_error_received(err)
+        except FIXParserError as err:
+            self._deliver_batch()
+            self.reset(flush_buffer=True)
+            self._receiver.on_error_received(err)
+        finally:
+            self.is_receiving_data = False
+
+    def _parse_buffer(self):
+        """ Parses the fields in the buffer.  This is the main loop
+            of on_data_received().
+
+            Raises:
+                FIXParserError
+                FIXLengthTooLongError
+        """
+        # pylint: disable=too-many-branches
+        # Without any groups every field goes to the top level, so
+        # skip the group handling
+        if self._group_fields:
+            update_field = self._update_field
+        else:
+            update_field = self._set_field
+
+        # Checked once per buffer, so the loop does not format anything
+        # when debug logging is off
+        debug = self._debug and self._logger.isEnabledFor(logging.DEBUG)
+
+        # Keep looping while we have unprocessed data
+        # We start processing only once we have an entire field
+        # (e.g. 'id=value') in the buffer, otherwise wait for more
+        # data.
+        # The problem with the current approach is that if there is a
+        # binary field with an incorrect length, we may read past
+        # the end of the message.
+        # BUGBUG: Need to fix this. A quick hack may be to
+        # try to peek to see what the tag id is and do something
+        # with that.  On the other hand this may just be a problem
+        # with the protocol (should probably specify a maximum
+        # allowable length of a binary field as a sanity check)
+        buf = self._buffer
+        pos = self._pos
+
+        # A partially received message always starts the buffer
+        msg_start = 0
 
+        try:
+            while True:
                 # Need to make sure that we have the entire binary field
                 # before continuing the processing
                 if (self._binary_length > 0 and
-                        len(self._buffer) < self._binary_length):
+                        len(buf) - pos < self._binary_length):
                     break
 
-                # break up the field
-                delim = self._buffer.find(b'\x01', self._binary_length + 1)
-                field = self._buffer[:delim]
-                self._buffer = self._buffer[delim+1:]
+                # break up the field, the SOH is only searched for once
+                # and a partial field is not searched again
+                delim = buf.find(
+                    b'\x01',
+                    max(pos + self._binary_length + 1, self._scan_pos))
+                if delim == -1:
+                    self._scan_pos = len(buf)
+                    break
+                field_start = pos
+                field = bytes(buf[pos:delim])
+                pos = delim + 1
+                self._scan_pos = 0
 
                 tag_id, value = self._parse_field(field)
 
@@ -302,35 +427,66 @@ class FIXParser:
                     if self.is_parsing:
                         raise FIXParserError('unexpected tag: 8')
                     self.is_parsing = True
+                    msg_start = field_start
                 elif not self.is_parsing:
                     raise FIXParserError('message must start with tag 8')
 
-                if self._debug:
+                if debug:
                     log_text(self._logger.debug, None,
-                             f"tag {tag_id} = {repr(value)}")
+                             f"tag {tag_id} = {value!r}")
+
+                # Only the length limit is checked for each field
+                if tag_id not in _LENGTH_EXCLUDE:
+                    length = pos - msg_start - self._header_length
+                    if length >= self._max_length:
+                        raise FIXLengthTooLongError(
+                            f'message too long: {length}')
+                elif tag_id != 10:
+                    self._header_length += pos - field_start
 
-                self._update_length(field, tag_id, value)
-                self._update_checksum(field, tag_id, value)
                 self._update_binary(field, tag_id, value)
 
                 # The tag value gets assigned here. Due to grouping
                 # the container where the update takes place gets
                 # changed
                 # self._message[tag_id] = value
-                self._update_field(tag_id, value)
+                update_field(tag_id, value)
 
                 # Is this the end of a message?
                 if tag_id == 10:
-                    self._receiver.on_message_received(self._message,
-                                                       self._message_length,
-                                                       self._checksum)
-                    self.reset()
-
-        except FIXLengthTooLongError as err:
-            self.reset(flush_buffer=True)
-            self._receiver.on_error_received(err)
-        except FIXParserError as err:
-            self.reset(flush_buffer=True)
-            self._receiver.on_error_received(err)
+                    self._pos = pos
+                    self._end_message(
+                        field_start - msg_start - self._header_length,
+                        checksum(buf[msg_start:field_start]))
         finally:
-            self.is_receiving_data = False
+            # Drop everything that has been parsed, except for the
+            # fields of a partial message
+            start = msg_start if self.is_parsing else pos
+            if start:
+                del buf[:start]
+                pos -= start
+                if self._scan_pos:
+                    self._scan_pos -= start
+            self._pos = pos
+
+    def _end_message(self, message_length, message_checksum):
+        """ Passes the completed message on to the receiver (or adds
+            it to the batch) and gets ready for the next message.
+        """
+        if self._batch is None:
+            self._receiver.on_message_received(self._message,
+                                               message_length,
+                                               message_checksum)
+        else:
+            self._batch.append((self._message,
+                                message_length,
+                                message_checksum))
+        self.reset()
+
+    def _deliver_batch(self):
+        """ Passes the messages collected in batch mode to the receiver.
+        """
+        batch = self._batch
+        if batch:
+            self._batch = []
+            self._receiver.on_messages_received(batch)
@@ -7,7 +7,9 @@
 """
 
 import datetime
+import itertools
 import logging
+import time
 
 from fixtest.fix.constants import FIX
 from fixtest.fix.message import FIXMessage
@@ -15,6 +17,30 @@ from fixtest.fix.parser import FIXParser
 from fixtest.fix.utils import format_time
 
 
+# Marks a missing tag in _missing_field()
+_MISSING = object()
+
+
+def _missing_field(message, tags):
+    """ Returns the first of the tags that is missing from the
+        message or has an empty value, None if there is no such tag.
+
+        Args:
+            message: A FIXMessage.
+            tags: A tuple of int tags.
+    """
+    # The values are looked up and checked in C, the tags are only
+    # walked one at a time if one of them fails
+    values = tuple(map(dict.get, itertools.repeat(message), tags,
+                       itertools.repeat(_MISSING)))
+    if _MISSING not in values and '' not in values:
+        return None
+    for tag, value in zip(tags, values):
+        if value is _MISSING or value == '':
+            return tag
+    return None
+
+
 class FIXDataError(ValueError):
     """ Exception: Problem found with the data in the message. """
     def __init__(self, refid, message):
@@ -92,17 +118,45 @@ class FIXProtocol:
         if len(self.link_config.get('protocol_version', '')) == 0:
             raise ValueError('link_config missing protocol_version')
 
+        # The link settings used for every message, looked up once.
+        # 9 and 10 are updated when generating the binary, so they
+        # are not checked before sending.
+        self._protocol_version = self.link_config['protocol_version']
+        self._sender_compid = self.link_config.get('sender_compid')
+        self._target_compid = self.link_config.get('target_compid')
+        self._common_fields = tuple(self.link_config.get('common_fields', ()))
+        self._required_fields = tuple(
+            int(tag) for tag in self.link_config.get('required_fields', ()))
+        self._required_send_fields = tuple(
+            tag for tag in self._required_fields if tag not in {9, 10})
+
+        # The session messages only differ in the TestReqID (112), so
+        # they are copied from these (a copy between FIXMessages does
+        # not go through the key conversion)
+        self._heartbeat_template = FIXMessage(
+            source=[(35, FIX.HEARTBEAT),
+                    (49, self._sender_compid),
+                    (56, self._target_compid)])
+        self._testrequest_template = FIXMessage(
+            source=[(35, FIX.TEST_REQUEST),
+                    (49, self._sender_compid),
+                    (56, self._target_compid)])
+
         # heartbeat processing
         self.heartbeat = self.link_config.get('heartbeat', 0)
         self.filter_heartbeat = False
         self._testrequest_id = None
         self._testrequest_time = None
 
-        # protocol state information
+        # protocol state information, the times are from time.monotonic()
         self._send_seqno = self.link_config.get('send_seqno', 0)
-        self._last_send_time = datetime.datetime.now()
+        self._last_send_time = time.monotonic()
         self._received_seqno = 0
-        self._last_received_time = datetime.datetime.now()
+        self._last_received_time = time.monotonic()
+
+        # The SendingTime (52) value only changes once a second
+        self._send_time_second = None
+        self._send_time_text = ''
 
         self._parser = FIXParser(self,
                                  header_fields=self.link_config.get(
@@ -112,7 +166,9 @@ class FIXProtocol:
                                  group_fields=self.link_config.get(
                                      'group_fields', None),
                                  max_length=self.link_config.get(
-                                     'max_length', 2048))
+                                     'max_length', 2048),
+                                 batch_callbacks=self.link_config.get(
+                                     'batch_callbacks', False))
 
         self._logger = logging.getLogger(__name__)
 
@@ -126,79 +182,102 @@ class FIXProtocol:
         """ Sends a message via the transport.
         """
         self._send_seqno += 1
-        send_time = datetime.datetime.now()
 
         # update some of the required fields for sending
-        message[8] = self.link_config['protocol_version']
+        message[8] = self._protocol_version
         message[34] = self._send_seqno
-        message[52] = format_time(send_time)
+        message[52] = self._sending_time()
 
         # apply any common fields
-        if 'common_fields' in self.link_config:
-            for tag, value in self.link_config['common_fields']:
-                message[tag] = value
+        for tag, value in self._common_fields:
+            message[tag] = value
 
         # verify required tags
-        for tag in self.link_config['required_fields']:
-            # these two tags are updated when generating the binary
-            if tag in {9, 10}:
-                continue
+        tag = _missing_field(message, self._required_send_fields)
+        if tag is not None:
+            raise FIXDataError(tag, f'missing field: id:{tag}')
 
-            if tag not in message or len(str(message[tag])) == 0:
-                raise FIXDataError(tag, f'missing field: id:{tag}')
-
-        self._last_send_time = send_time
+        self._last_send_time = time.monotonic()
         return message
 
+    def _sending_time(self):
+        """ Returns the SendingTime (52) value for the current time.
+
+            The value only has a resolution of seconds, so it is only
+            formatted again once the second has changed.
+        """
+        second = int(time.time())
+        if second != self._send_time_second:
+            self._send_time_second = second
+            self._send_time_text = format_time(
+                datetime.datetime.fromtimestamp(second))
+        return self._send_time_text
+
     def on_message_received(self, message, message_length, checksum):
         """ This is the callback from the parser when a message has
             been received.
         """
         # pylint: disable=consider-using-f-string
         # verify required tags
-        for tag in self.link_config['required_fields']:
-            if tag not in message or len(str(message[tag])) == 0:
-                raise FIXDataError(tag, f'missing field: id:{tag}')
+        tag = _missing_field(message, self._required_fields)
+        if tag is not None:
+            raise FIXDataError(tag, f'missing field: id:{tag}')
 
         # verify the protocol version
-        if 'protocol_version' in self.link_config:
-            if self.link_config['protocol_version'] != message[8]:
-                raise FIXDataError(
-                    8, 'version mismatch: expect:{0} received:{1}'.format(
-                        self.link_config['protocol_version'],
-                        message[8]
-                        ))
-
-        # verify the length and checksum
-        if message_length != int(message[9]):
+        if self._protocol_version != message[8]:
+            raise FIXDataError(
+                8, 'version mismatch: expect:{0} received:{1}'.format(
+                    self._protocol_version,
+                    message[8]
+                    ))
+
+        # verify the length and checksum (the parser computes these
+        # from the received bytes, so only the fields are converted)
+        body_length = int(message[9])
+        if message_length != body_length:
             raise FIXDataError(
                 9, 'length mismatch: expect:{0} received:{1}'.format(
-                    message_length, int(message[9])))
+                    message_length, body_length))
 
         if checksum != int(message[10]):
             raise FIXDataError(
                 10, 'checksum mismatch: expect:{0} received:{1}'.format(
                     checksum, message[10]))
 
-        self._last_received_time = datetime.datetime.now()
+        self._last_received_time = time.monotonic()
+
+        # The session messages are handled here, and only passed on
+        # if they are not filtered
+        msg_type = message.msg_type()
+        if msg_type == FIX.HEARTBEAT:
+            # Have we received our testrequest response?
+            if message.get(112, '') == self._testrequest_id:
+                self._testrequest_time = None
+                self._testrequest_id = None
+            if self.filter_heartbeat:
+                return
+
+        elif msg_type == FIX.TEST_REQUEST:
+            # We have received a testrequest and need to send a response
+            heartbeat = FIXMessage(source=self._heartbeat_template)
+            heartbeat[112] = message[112]
+            self.transport.send_message(heartbeat)
+            if self.filter_heartbeat:
+                return
+
+        self.transport.on_message_received(message)
+
+    def on_messages_received(self, messages):
+        """ This is the callback from the parser when batch_callbacks
+            is enabled, with all of the messages parsed from a single
+            read.
 
-        # Have we received our testrequest response?
-        if (message.msg_type() == FIX.HEARTBEAT and
-                message.get(112, '') == self._testrequest_id):
-            self._testrequest_time = None
-            self._testrequest_id = None
-
-        # We have received a testrequest and need to send a response
-        if message.msg_type() == FIX.TEST_REQUEST:
-            self.transport.send_message(
-                FIXMessage(source=[(35, FIX.HEARTBEAT),
-                                   (112, message[112]),
-                                   (49, self.link_config['sender_compid']),
-                                   (56, self.link_config['target_compid'])]))
-
-        if (not self.filter_heartbeat or
-                (message.msg_type() not in {FIX.HEARTBEAT, FIX.TEST_REQUEST})):
-            self.transport.on_message_received(message)
+            Args:
+                messages: A list of (message, message_length, checksum)
+                    tuples.
+        """
+        for message, message_length, checksum in messages:
+            self.on_message_received(message, message_length, checksum)
 
     def on_error_received(self, error):
         """ This is the callback from the parser when an error in the
@@ -213,29 +292,25 @@ class FIXProtocol:
         if self.heartbeat <= 0:
             return
 
-        now = datetime.datetime.now()
+        now = time.monotonic()
 
         # Have we received a testrequest response before we timed out?
         if (self._testrequest_id is not None and
-                (now - self._testrequest_time).seconds > 2*self.heartbeat):
+                now - self._testrequest_time > 2*self.heartbeat):
             raise FIXTimeoutError('testrequest response timeout')
 
         # if heartbeat seconds/2 have elapsed since the last time
         # a message was sent, send a heartbeat
-        if (now - self._last_send_time).seconds > (self.heartbeat/2):
+        if now - self._last_send_time > (self.heartbeat/2):
             self.transport.send_message(
-                FIXMessage(source=[(35, FIX.HEARTBEAT),
-                                   (49, self.link_config['sender_compid']),
-                                   (56, self.link_config['target_compid'])]))
+                FIXMessage(source=self._heartbeat_template))
 
         # if heartbeat seconds + "some transmission time" have elapsed
         # since a message was received, send a TestRequest
-        if (now - self._last_received_time).seconds > self.heartbeat:
-            testrequest_id = f"TR{format_time(now)}"
+        if now - self._last_received_time > self.heartbeat:
+            testrequest_id = f"TR{format_time(datetime.datetime.now())}"
             self._testrequest_time = now
             self._testrequest_id = testrequest_id
-            self.transport.send_message(
-                FIXMessage(source=[(35, FIX.TEST_REQUEST),
-                                   (112, testrequest_id),
-                                   (49, self.link_config['sender_compid']),
-                                   (56, self.link_config['target_compid'])]))
+            testrequest = FIXMessage(source=self._testrequest_template)
+            testrequest[112] = testrequest_id
+            self.transport.send_message(testrequest)
@@ -8,6 +8,7 @@
 
 import datetime
 import logging
+import threading
 
 from twisted import internet
 from twisted.internet import task, reactor
@@ -20,6 +21,10 @@ from fixtest.fix.protocol import FIXProtocol
 from fixtest.fix.utils import log_message
 
 
+# The session level messages, these are not added to the queue
+_SESSION_MSG_TYPES = frozenset((FIX.HEARTBEAT, FIX.TEST_REQUEST))
+
+
 class FIXTransportFactory(internet.protocol.Factory):
     """ The factory interface for the FIX Transport.
 
@@ -132,6 +137,13 @@ class FIXTransport(internet.protocol.Protocol):
         self.target_compid = link_config['target_compid']
         self._orderid_no = 0
 
+        # Messages waiting to be written by the reactor thread.  The
+        # messages sent before the reactor gets to them are written
+        # together with a single writeSequence().
+        self._send_lock = threading.Lock()
+        self._pending = []
+        self._flush_scheduled = False
+
         self._logger = logging.getLogger(__name__)
 
     def get_next_orderid(self):
@@ -167,7 +179,7 @@ class FIXTransport(internet.protocol.Protocol):
 
         # forward the message to the queue only if not a
         # heartbeat/testrequest
-        if message.msg_type() not in {FIX.HEARTBEAT, FIX.TEST_REQUEST}:
+        if message.msg_type() not in _SESSION_MSG_TYPES:
             self.queue.add(message)
 
     def send_message(self, message):
@@ -179,7 +191,24 @@ class FIXTransport(internet.protocol.Protocol):
         log_message(self._logger.info, self.name, message, 'message sent')
 
         if self.transport is not None:
-            reactor.callFromThread(self.transport.write, data)
+            with self._send_lock:
+                self._pending.append(data)
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
+            reactor.callFromThread(self._flush_pending)
+
+    def _flush_pending(self):
+        """ Writes out the pending messages.  This is called in the
+            reactor thread.
+        """
+        with self._send_lock:
+            pending = self._pending
+            self._pending = []
+            self._flush_scheduled = False
+
+        if self.transport is not None and pending:
+            self.transport.writeSequence(pending)
 
     def cancel(self):
         """ Cancel any remaining operations.
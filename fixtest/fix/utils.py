@@ -5,28 +5,27 @@
 
 """
 
-import collections
+import collections.abc
 
 from fixtest.base.utils import format_log_line
 from fixtest.fix.constants import FIX
 
 
 def flatten(container):
-    """ Creates a list of tuples (k, v) from a dictionary
+    """ Generates the tuples (k, v) from a dictionary
 
         This is FIX specific.  If a key maps to a container, say
         (k: v) where v is another dict(), then the item (k, len(v))
-        is added to the list of items, followed by
-        (k, v[0]), (k, v[1]), ...
+        is generated, followed by (k, v[0]), (k, v[1]), ...
+
+        Use list(flatten(container)) if a list is needed.
     """
-    items = []
     for key, value in container.items():
         if isinstance(value, collections.abc.MutableMapping):
-            items.append((key, len(value)))
-            items.extend(flatten(value))
+            yield (key, len(value))
+            yield from flatten(value)
         else:
-            items.append((key, value))
-    return items
+            yield (key, value)
 
 
 def format_time(input_datetime):
@@ -43,7 +42,7 @@ def format_time(input_datetime):
 
 def format_message(message):
     """ Formats a FIX message for easier reading """
-    return ', '.join([f"{k}={v}" for k, v in flatten(message)])
+    return ', '.join(f"{k}={v}" for k, v in flatten(message))
 
 
 def log_message(log, header, message, text):
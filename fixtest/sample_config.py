@@ -97,6 +97,8 @@ FIX_4_2 = {
 #   common_fields: A list of tag/value tuples which will be added
 #       to every message sent
 #   max_length: The maximum length of message (Default: 2048)
+#   batch_callbacks: Set to True to have the parser pass all of the
+#       messages from a network read at once (Default: False)
 #
 #   FIX connection information:
 #   ==========================
@@ -6,6 +6,7 @@
 """
 
 import os
+import tempfile
 import unittest
 
 from fixtest.base.config import FileConfig, DictConfig
@@ -65,6 +66,24 @@ class TestConfig(unittest.TestCase):
         self.assertRaises(KeyError, self.config.get_link,
                           'client', 'serverY')
 
+    def test_get_link_after_update(self):
+        self.config.get_link('clientX', 'serverY')
+        self.config.update({
+            'CONNECTIONS': [
+                {
+                    'name': 'client-fix-gateway',
+                    'protocol': 'FIX',
+                    'clientX': 'client1',
+                    'gatewayZ': 'gateway1',
+                    'acts-as-server': 'gatewayZ',
+                }
+            ],
+        })
+        link_config = self.config.get_link('clientX', 'gatewayZ')
+        self.assertEqual('client-fix-gateway', link_config['name'])
+        self.assertRaises(KeyError, self.config.get_link,
+                          'clientX', 'serverY')
+
     def test_get_section(self):
         other_config = self.config.get_section('OTHER')
         self.assertIsNotNone(other_config)
@@ -73,6 +92,22 @@ class TestConfig(unittest.TestCase):
         self.assertRaises(KeyError, self.config.get_section,
                           'OTHERXX')
 
+    def test_returns_copies(self):
+        """ Changes to returned configs do not affect the source """
+        role_config = self.config.get_role('serverY')
+        role_config['admin-port'] = 1
+        self.assertEqual(19001, self.config.get_role('serverY')['admin-port'])
+
+        link_config = self.config.get_link('clientX', 'serverY')
+        link_config['name'] = 'changed'
+        self.assertEqual('client-fix-server',
+                         self.config.get_link('clientX', 'serverY')['name'])
+
+        other_config = self.config.get_section('CONNECTIONS')
+        other_config[0]['port'] = 1
+        self.assertEqual(8080,
+                         self.config.get_section('CONNECTIONS')[0]['port'])
+
 
 class TestFileConfig(unittest.TestCase):
     # pylint: disable=missing-docstring
@@ -92,3 +127,22 @@ class TestFileConfig(unittest.TestCase):
         link_config = config.get_link('client', 'gateway', 'FIX')
         self.assertIsNotNone(link_config)
         self.assertEqual('client-FIX-gateway', link_config['name'])
+
+
+class TestFileConfigReload(unittest.TestCase):
+    # pylint: disable=missing-docstring
+    def test_reload_modified_file(self):
+        with tempfile.TemporaryDirectory() as dir_name:
+            file_path = os.path.join(dir_name, 'reload_config.py')
+
+            with open(file_path, 'w', encoding='utf-8') as config_file:
+                config_file.write("ROLES = {'client': {'port': 1}}\n")
+            os.utime(file_path, ns=(1000000000, 1000000000))
+            config = FileConfig(file_path)
+            self.assertEqual(1, config.get_role('client')['port'])
+
+            with open(file_path, 'w', encoding='utf-8') as config_file:
+                config_file.write("ROLES = {'client': {'port': 2}}\n")
+            os.utime(file_path, ns=(2000000000, 2000000000))
+            config = FileConfig(file_path)
+            self.assertEqual(2, config.get_role('client')['port'])
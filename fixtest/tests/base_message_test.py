@@ -55,6 +55,25 @@ class TestBasicMessage(unittest.TestCase):
         self.assertFalse(33 in mess)
         self.assertFalse('33' in mess)
 
+    def test_key_methods(self):
+        """ Verify that the dict methods also convert the keys.
+        """
+        mess = BasicMessage(source=[(22, 'abcd')])
+
+        self.assertEqual('abcd', mess.get(22))
+        self.assertEqual('abcd', mess.get('22'))
+        self.assertIsNone(mess.get(33))
+        self.assertEqual('x', mess.setdefault(33, 'x'))
+        self.assertEqual('x', mess['33'])
+        self.assertEqual('x', mess.pop(33))
+        self.assertEqual(None, mess.pop(33, None))
+        self.assertEqual(['22'], list(mess.keys()))
+
+    def test_equality(self):
+        mess = BasicMessage(source=[(1, 11), (2, 12)])
+        self.assertEqual(BasicMessage(source=[('1', 11), ('2', 12)]), mess)
+        self.assertNotEqual(BasicMessage(source=[(1, 11)]), mess)
+
     def test_from_message(self):
         """ Verify that the message has the same fields as source message.
         """
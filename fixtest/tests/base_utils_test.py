@@ -0,0 +1,62 @@
+""" base.utils unit tests
+
+    Copyright (c) 2014-2022 Kenn Takara
+    See LICENSE for details
+
+"""
+
+import datetime
+import logging
+import re
+import unittest
+
+from fixtest.base.utils import current_timestamp, log_text
+
+
+class TestCurrentTimestamp(unittest.TestCase):
+    # pylint: disable=missing-docstring
+
+    def test_format(self):
+        stamp = current_timestamp()
+        self.assertIsNotNone(re.fullmatch(r'\d{2}:\d{2}:\d{2}\.\d{6}', stamp))
+        # Must parse back with the strftime format it replaces
+        datetime.datetime.strptime(stamp, "%H:%M:%S.%f")
+
+
+class TestLogText(unittest.TestCase):
+    # pylint: disable=missing-docstring
+
+    def setUp(self):
+        self.logger = logging.getLogger('fixtest.tests.base_utils_test')
+        self.logger.setLevel(logging.INFO)
+
+    def test_enabled(self):
+        with self.assertLogs(self.logger, logging.INFO) as logs:
+            log_text(self.logger.info, 'header', 'hello')
+        self.assertEqual(1, len(logs.output))
+        self.assertTrue(logs.output[0].endswith(': header: hello'))
+
+    def test_disabled_level(self):
+        calls = []
+
+        def text():
+            calls.append(1)
+            return 'hello'
+
+        log_text(self.logger.debug, None, text)
+        self.assertEqual(0, len(calls))
+
+        with self.assertLogs(self.logger, logging.INFO) as logs:
+            log_text(self.logger.info, None, text)
+        self.assertEqual(1, len(calls))
+        self.assertTrue(logs.output[0].endswith(': hello'))
+
+    def test_plain_callable(self):
+        lines = []
+        log_text(lines.append, None, 'hello')
+        self.assertEqual(1, len(lines))
+        self.assertTrue(lines[0].endswith(': hello'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+""" fix.constants unit tests
+
+    Copyright (c) 2014-2022 Kenn Takara
+    See LICENSE for details
+
+"""
+
+import unittest
+
+from fixtest.fix.constants import FIX
+
+
+class TestFIXConstants(unittest.TestCase):
+    # pylint: disable=missing-docstring
+
+    def test_find_msgtype(self):
+        self.assertEqual('Logon', FIX.find_msgtype(FIX.LOGON))
+        self.assertEqual('Logon', FIX.find_msgtype(b'A'))
+        self.assertEqual('Heartbeat', FIX.find_msgtype(0))
+        self.assertEqual('???', FIX.find_msgtype('ZZZ'))
+        self.assertEqual('???', FIX.find_msgtype(b'ZZZ'))
+
+    def test_find_exectype(self):
+        self.assertEqual('Fill', FIX.find_exectype('2'))
+        self.assertEqual('Fill', FIX.find_exectype(b'2'))
+        self.assertEqual('Fill', FIX.find_exectype(2))
+        self.assertEqual('???', FIX.find_exectype(b'Z'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,17 @@ class TestFIXMessage(unittest.TestCase):
         self.assertEqual(1, checksum(b'\x01'))
         self.assertEqual(2, checksum(b'\x01\x01'))
         self.assertEqual(2, checksum(b'\xFF\x03'))
+        self.assertEqual(0, checksum(b''))
+        self.assertEqual(5, checksum(b'', 5))
+        self.assertEqual(4, checksum(b'\xFF\x03', 258))
+
+        # large messages are summed in chunks
+        data = bytes(range(256)) * 40 + b'\xFF' * 1001
+        self.assertEqual(sum(data) % 256, checksum(data))
+        self.assertEqual((sum(data) + 7) % 256, checksum(data, 7))
+        self.assertEqual(sum(data) % 256, checksum(bytearray(data)))
+        self.assertEqual(sum(data) % 256, checksum(memoryview(data)))
+        self.assertEqual(2, checksum(memoryview(b'\xFF\x03')))
 
         # example taken from wikipedia
         self.assertEqual(62,
@@ -73,6 +84,27 @@ class TestFIXMessage(unittest.TestCase):
         self.assertEqual(FIX.LOGON, mess[35])
         self.assertEqual(FIX.LOGON, mess.msg_type())
 
+        # bytes values are stored decoded
+        mess[35] = b'D'
+        self.assertEqual('D', mess[35])
+        self.assertEqual('D', mess.msg_type())
+
+        mess.update({35: b'E'})
+        self.assertEqual('E', mess.msg_type())
+
+        mess = FIXMessage(header_fields=[8, 9])
+        self.assertEqual('F', mess.setdefault('35', b'F'))
+        self.assertEqual('F', mess.msg_type())
+
+    def test_equality(self):
+        """ Messages compare equal using the builtin dict comparison """
+        mess = FIXMessage(source=[(35, 'A'), (49, 'SERVER')])
+        self.assertEqual(FIXMessage(source=[('35', 'A'), ('49', 'SERVER')]),
+                         mess)
+        self.assertEqual({8: '', 9: '', 35: 'A', 49: 'SERVER', 56: ''},
+                         mess)
+        self.assertNotEqual(FIXMessage(source=[(35, 'D')]), mess)
+
     def test_to_binary(self):
         mess = FIXMessage()
         mess[8] = 'FIX.4.2'
@@ -105,6 +137,65 @@ class TestFIXMessage(unittest.TestCase):
                                 '10=062'),
                          data)
 
+    def test_to_binary_repeated(self):
+        """ Calling to_binary() again gives the same result, even
+            though 9 and 10 were updated by the first call.
+        """
+        mess = FIXMessage(source=[(8, 'FIX.4.2'),
+                                  (35, 'A'),
+                                  (49, 'SERVER'),
+                                  (56, 'CLIENT')])
+        data = mess.to_binary()
+        self.assertEqual(data, mess.to_binary())
+        self.assertEqual(10, list(mess.keys())[-1])
+
+    def test_to_binary_cached(self):
+        mess = FIXMessage(source=[(8, 'FIX.4.2'),
+                                  (35, 'A'),
+                                  (49, 'SERVER'),
+                                  (56, 'CLIENT')])
+        data = mess.to_binary()
+        self.assertIs(data, mess.to_binary())
+
+        # modifying the message invalidates the cached copy
+        mess[177] = 'hello'
+        data = mess.to_binary()
+        self.assertEqual(to_fix('8=FIX.4.2',
+                                '9=35',
+                                '35=A',
+                                '49=SERVER',
+                                '56=CLIENT',
+                                '177=hello',
+                                '10=192'), data)
+
+        del mess[177]
+        self.assertNotEqual(data, mess.to_binary())
+
+    def test_to_binary_groups_not_cached(self):
+        mess = FIXMessage(source=[(8, 'FIX.4.2'),
+                                  (35, 'A'),
+                                  (555, [{600: 'A'}])])
+        data = mess.to_binary()
+
+        # the group is modified in place
+        mess[555][0][600] = 'B'
+        self.assertNotEqual(data, mess.to_binary())
+
+    def test_to_binary_checksum(self):
+        """ The checksum is built up from the header and the body
+            separately, it must match a checksum of the whole message.
+        """
+        for length in (1, 200, 300, 5000):
+            mess = FIXMessage(source=[(8, 'FIX.4.2'),
+                                      (35, 'A'),
+                                      (49, 'SERVER'),
+                                      (56, 'CLIENT'),
+                                      (58, 'x' * length)])
+            data = mess.to_binary()
+            trailer = data.rindex(b'10=')
+            self.assertEqual(f'{checksum(data[:trailer]):03d}', mess[10])
+            self.assertEqual(f'10={mess[10]}\x01'.encode(), data[trailer:])
+
     def test_to_binary_include(self):
         mess = FIXMessage()
         mess[8] = 'FIX.4.2'
@@ -122,6 +213,22 @@ class TestFIXMessage(unittest.TestCase):
                                 '10=212'),
                          data)
 
+    def test_to_binary_string_keys(self):
+        """ Keys are stored as ints, whatever type they were set with """
+        mess = FIXMessage()
+        mess['8'] = 'FIX.4.2'
+        mess['35'] = 'A'
+        mess['177'] = 'hello'
+        self.assertTrue(all(isinstance(k, int) for k in mess.keys()))
+
+        data = mess.to_binary(include=['8', '9', '35', '177'])
+        self.assertEqual(to_fix('8=FIX.4.2',
+                                '9=15',
+                                '35=A',
+                                '177=hello',
+                                '10=212'),
+                         data)
+
     def test_to_binary_exclude(self):
         mess = FIXMessage()
         mess[8] = 'FIX.4.2'
@@ -161,6 +268,22 @@ class TestFIXMessage(unittest.TestCase):
                                 '10=086'),
                          data)
 
+    def test_to_binary_group_tuple(self):
+        """ Call to_binary() on a group stored as a tuple """
+        mess = FIXMessage(header_fields=[8, 9])
+        mess[8] = 'FIX.4.2'
+        mess[100] = ({110: 2, 111: 'abcd'}, )
+        mess[112] = 'abc'
+
+        self.assertEqual(to_fix('8=FIX.4.2',
+                                '9=29',
+                                '100=1',
+                                '110=2',
+                                '111=abcd',
+                                '112=abc',
+                                '10=086'),
+                         mess.to_binary())
+
     def test_group_from_list(self):
         """ Call to_binary() on a grouped message from a list """
         mess = FIXMessage(header_fields=[8, 9],
@@ -205,6 +328,20 @@ class TestFIXMessage(unittest.TestCase):
                                 '10=034'),
                          mess.to_binary())
 
+    def test_deeply_nested_group(self):
+        """ Nesting deeper than the recursion limit can be written """
+        group = [{201: 'x'}]
+        for _ in range(2000):
+            group = [{200: group, 202: 'y'}]
+        mess = FIXMessage(header_fields=[8, 9])
+        mess[8] = 'FIX.4.2'
+        mess[100] = group
+
+        data = mess.to_binary()
+        self.assertEqual(2000, data.count(b'200=1\x01'))
+        self.assertTrue(data.endswith(b'201=x\x01' + b'202=y\x01' * 2000 +
+                                      b'10=' + mess[10].encode() + b'\x01'))
+
     def test_to_binary_binarydata(self):
         mess = FIXMessage(header_fields=[8, 9])
         mess[8] = 'FIX.4.2'
@@ -221,6 +358,17 @@ class TestFIXMessage(unittest.TestCase):
                                 '10=026'),
                          data)
 
+    def test_to_binary_bytearray(self):
+        mess = FIXMessage(header_fields=[8, 9])
+        mess[8] = b'FIX.4.2'
+        mess[110] = bytearray(b'abcd')
+
+        self.assertEqual(to_fix('8=FIX.4.2',
+                                '9=9',
+                                '110=abcd',
+                                '10=041'),
+                         mess.to_binary())
+
     def test_verify(self):
         mess = FIXMessage()
         mess[8] = 'FIX.4.2'
@@ -244,6 +392,10 @@ class TestFIXMessage(unittest.TestCase):
                                     exists=[56, 99, 177],
                                     not_exists=[2001, 2002, 2003]))
 
+        # exists and not_exists are checked independently
+        self.assertFalse(mess.verify(exists=[8], not_exists=[8]))
+        self.assertFalse(mess.verify(fields=[(2000, None)]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -481,6 +481,178 @@ class TestFIXParser(unittest.TestCase):
                                                (99, 'forsooth'),
                                                (10, '013')]))
 
+    def test_data_received_during_callback(self):
+        """ Data passed in from the message callback is appended to
+            the buffer and processed by the same loop.
+        """
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9])
+        second = to_fix('8=FIX.4.2',
+                        '9=17',
+                        '35=E',
+                        '99=forsooth',
+                        '10=013')
+
+        def on_message_received(message, message_length, checksum):
+            MockFIXReceiver.on_message_received(
+                self.receiver, message, message_length, checksum)
+            if self.receiver.count == 1:
+                parser.on_data_received(second)
+        self.receiver.on_message_received = on_message_received
+
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=5',
+                                       '35=A',
+                                       '10=178'))
+        self.assertFalse(parser.is_parsing)
+        self.assertEqual(2, self.receiver.count)
+        self.assertTrue(self.receiver.last_received_message.verify(
+            fields=[(35, 'E'), (99, 'forsooth')]))
+
+    def test_data_received_during_callback_too_long(self):
+        """ Data passed in from the message callback is limited """
+        errors = []
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9],
+                           max_length=100)
+
+        def on_message_received(message, message_length, checksum):
+            # pylint: disable=unused-argument
+            parser.on_data_received(b'x' * 201)
+        self.receiver.on_message_received = on_message_received
+        self.receiver.on_error_received = errors.append
+
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=5',
+                                       '35=A',
+                                       '10=178'))
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], FIXLengthTooLongError)
+        self.assertFalse(parser.is_parsing)
+        self.assertFalse(parser.is_receiving_data)
+
+    def test_checksum_zero(self):
+        """ A message whose checksum is 0 reports 0, not 256 """
+        checksums = []
+
+        def on_message_received(message, message_length, checksum):
+            # pylint: disable=unused-argument
+            checksums.append(checksum)
+        self.receiver.on_message_received = on_message_received
+
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9])
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=211',
+                                       '35=A',
+                                       '49=',
+                                       '56=',
+                                       '58=' + 'x'*194,
+                                       '10=000'))
+        self.assertEqual([0], checksums)
+
+    def test_batch_callbacks(self):
+        """ The messages from a single buffer are passed on at once """
+        batches = []
+        self.receiver.on_messages_received = batches.append
+
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9],
+                           batch_callbacks=True)
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=5',
+                                       '35=A',
+                                       '10=178') +
+                                to_fix('8=FIX.4.2',
+                                       '9=17',
+                                       '35=E',
+                                       '99=forsooth',
+                                       '10=013') +
+                                b'8=FIX.4.2\x019=5')
+        self.assertTrue(parser.is_parsing)
+        self.assertEqual(0, self.receiver.count)
+        self.assertEqual(1, len(batches))
+        self.assertEqual(2, len(batches[0]))
+
+        message, message_length, checksum = batches[0][1]
+        self.assertEqual(17, message_length)
+        self.assertEqual(13, checksum)
+        self.assertTrue(message.verify(fields=[(35, 'E'),
+                                               (99, 'forsooth')]))
+
+        # The rest of the message
+        parser.on_data_received(b'\x0135=A\x0110=178\x01')
+        self.assertFalse(parser.is_parsing)
+        self.assertEqual(2, len(batches))
+        self.assertEqual(1, len(batches[1]))
+
+    def test_batch_callbacks_before_error(self):
+        """ Messages parsed before an error are passed on first """
+        calls = []
+        self.receiver.on_messages_received = \
+            lambda messages: calls.append(len(messages))
+        self.receiver.on_error_received = \
+            lambda error: calls.append('error')
+
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9],
+                           batch_callbacks=True)
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=5',
+                                       '35=A',
+                                       '10=178') +
+                                b'35=A\x01')
+        self.assertEqual([1, 'error'], calls)
+        self.assertFalse(parser.is_parsing)
+
+    def test_split_message_length_checksum(self):
+        """ The length and checksum of a message received in pieces """
+        received = []
+
+        def on_message_received(message, message_length, checksum):
+            received.append((message[35], message_length, checksum))
+        self.receiver.on_message_received = on_message_received
+
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9])
+        text = to_fix('8=FIX.4.2',
+                      '9=5',
+                      '35=A',
+                      '10=178') + to_fix('8=FIX.4.2',
+                                         '9=17',
+                                         '35=E',
+                                         '99=forsooth',
+                                         '10=013')
+        for i in range(0, len(text), 7):
+            parser.on_data_received(text[i:i+7])
+        self.assertEqual([('A', 5, 178), ('E', 17, 13)], received)
+
+    def test_default_header_fields(self):
+        """ header_fields of None (as passed by the protocol) uses
+            the default header
+        """
+        parser = FIXParser(self.receiver, header_fields=None)
+        parser.on_data_received(to_fix('8=FIX.4.2',
+                                       '9=5',
+                                       '35=A',
+                                       '10=178'))
+        self.assertEqual(1, self.receiver.count)
+        self.assertEqual([8, 9, 35, 49, 56, 10],
+                         list(self.receiver.last_received_message.keys()))
+
+    def test_debug_logging(self):
+        """ With debug set, each field is logged """
+        parser = FIXParser(self.receiver,
+                           header_fields=[8, 9],
+                           debug=True)
+        with self.assertLogs('fixtest.fix.parser', level='DEBUG') as logs:
+            parser.on_data_received(to_fix('8=FIX.4.2',
+                                           '9=5',
+                                           '35=A',
+                                           '10=178'))
+        self.assertEqual(4, len(logs.output))
+        self.assertIn("tag 35 = b'A'", logs.output[2])
+
     def test_one_byte_at_a_time(self):
         """ Receive a message split up into single bytes """
         parser = FIXParser(self.receiver,
@@ -608,7 +780,6 @@ class TestFIXParser(unittest.TestCase):
         self.assertEqual(1, self.receiver.count)
 
         message = self.receiver.last_received_message
-        print(message.store)
         self.assertIsNotNone(message)
         self.assertEqual(4, len(message))
 
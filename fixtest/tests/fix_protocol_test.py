@@ -6,12 +6,13 @@
 """
 
 import datetime
+import time
 import unittest
 
 from fixtest.fix.constants import FIX
 from fixtest.fix.message import FIXMessage
 from fixtest.fix.protocol import FIXProtocol, FIXDataError, FIXTimeoutError
-from fixtest.fix.utils import flatten
+from fixtest.fix.utils import flatten, format_time
 from fixtest.tests.utils import to_fix
 
 # pylint: disable=too-many-public-methods
@@ -116,7 +117,7 @@ class TestFIXProtocol(unittest.TestCase):
                                               '35=A',
                                               '10=252'))
         self.assertIsNotNone(self.transport.last_message_received)
-        items = flatten(self.transport.last_message_received)
+        items = list(flatten(self.transport.last_message_received))
 
         # the order should be restored because the header fields will
         # have been pre-added.
@@ -130,8 +131,8 @@ class TestFIXProtocol(unittest.TestCase):
     def test_send_heartbeat(self):
         """ Test heartbeat sending """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=1)
-        self.protocol._last_send_time = now - datetime.timedelta(minutes=1)
+        now = time.monotonic() - 1
+        self.protocol._last_send_time = now - 60
         self.protocol._last_received_time = now
         last_time = self.protocol._last_send_time
 
@@ -149,10 +150,24 @@ class TestFIXProtocol(unittest.TestCase):
         self.assertEqual(FIX.HEARTBEAT, message.msg_type())
         self.assertNotEqual(last_time, self.protocol._last_send_time)
 
+    def test_send_heartbeat_after_a_day(self):
+        """ Idle times of more than a day still send a heartbeat """
+        # pylint: disable=protected-access
+        now = time.monotonic()
+        self.protocol._last_send_time = now - (24*60*60 + 1)
+        self.protocol._last_received_time = now
+        self.protocol.heartbeat = 5     # time in secs
+
+        self.protocol.on_timer_tick_received()
+
+        self.assertEqual(1, self.transport.message_sent_count)
+        self.assertEqual(FIX.HEARTBEAT,
+                         self.transport.last_message_sent.msg_type())
+
     def test_receive_heartbeat(self):
         """ Test receiving heartbeat """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=2)
+        now = time.monotonic() - 2
         self.protocol._last_send_time = now
         self.protocol._last_received_time = now
         last_time = self.protocol._last_received_time
@@ -166,11 +181,26 @@ class TestFIXProtocol(unittest.TestCase):
         self.assertEqual(1, self.transport.message_received_count)
         self.assertNotEqual(last_time, self.protocol._last_received_time)
 
+    def test_receive_testrequest_response(self):
+        """ A heartbeat with our TestReqID ends the TestRequest """
+        # pylint: disable=protected-access
+        self.protocol._testrequest_id = 'TR1'
+        self.protocol._testrequest_time = time.monotonic()
+        self.protocol.filter_heartbeat = True
+
+        self.protocol.on_data_received(
+            FIXMessage(source=[(8, 'FIX.4.2'),
+                               (35, FIX.HEARTBEAT),
+                               (112, 'TR1')]).to_binary())
+        self.assertIsNone(self.protocol._testrequest_id)
+        self.assertIsNone(self.protocol._testrequest_time)
+        self.assertEqual(0, self.transport.message_received_count)
+
     def test_filter_heartbeat(self):
         """ Test heartbeat filtering """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=1)
-        self.protocol._last_send_time = now - datetime.timedelta(minutes=1)
+        now = time.monotonic() - 1
+        self.protocol._last_send_time = now - 60
         self.protocol._last_received_time = now
         last_time = self.protocol._last_received_time
 
@@ -189,8 +219,8 @@ class TestFIXProtocol(unittest.TestCase):
     def test_send_testrequest(self):
         """ TestRequest sending """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=1)
-        self.protocol._last_received_time = now - datetime.timedelta(minutes=1)
+        now = time.monotonic() - 1
+        self.protocol._last_received_time = now - 60
         self.protocol._last_send_time = now
         last_time = self.protocol._last_send_time
 
@@ -211,7 +241,7 @@ class TestFIXProtocol(unittest.TestCase):
     def test_receive_testrequest(self):
         """ Test receiving testrequest """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=2)
+        now = time.monotonic() - 2
         self.protocol._last_send_time = now
         self.protocol._last_received_time = now
         last_time = self.protocol._last_received_time
@@ -229,8 +259,8 @@ class TestFIXProtocol(unittest.TestCase):
     def test_filter_testrequest(self):
         """ Test testrequest filtering """
         # pylint: disable=protected-access
-        now = datetime.datetime.now() - datetime.timedelta(seconds=1)
-        self.protocol._last_send_time = now - datetime.timedelta(minutes=1)
+        now = time.monotonic() - 1
+        self.protocol._last_send_time = now - 60
         self.protocol._last_received_time = now
         last_time = self.protocol._last_received_time
 
@@ -251,11 +281,11 @@ class TestFIXProtocol(unittest.TestCase):
         """ TestRequest timeout testing """
         # pylint: disable=protected-access
         self.protocol.heartbeat = 5     # time in secs
-        now = datetime.datetime.now()
+        now = time.monotonic()
 
         # set this to simulate that a TestRequest was sent
         self.protocol._testrequest_id = 'TR1'
-        self.protocol._testrequest_time = now - datetime.timedelta(seconds=50)
+        self.protocol._testrequest_time = now - 50
 
         # force a timer tick
         with self.assertRaises(FIXTimeoutError):
@@ -292,3 +322,25 @@ class TestFIXProtocol(unittest.TestCase):
         # check for seqno(34) and sendtime(52)
         self.assertTrue(34 in self.transport.last_message_sent)
         self.assertTrue(52 in self.transport.last_message_sent)
+
+    def test_send_time(self):
+        """ SendingTime (52) is formatted the same for every message """
+        # pylint: disable=protected-access
+        first = FIXMessage(source=[(8, 'FIX.4.2'), (35, 'A'), ])
+        second = FIXMessage(source=[(8, 'FIX.4.2'), (35, 'A'), ])
+        self.transport.send_message(first)
+        self.transport.send_message(second)
+
+        self.assertRegex(first[52], r'^\d{8}-\d{2}:\d{2}:\d{2}$')
+        self.assertRegex(second[52], r'^\d{8}-\d{2}:\d{2}:\d{2}$')
+        self.assertEqual(
+            format_time(datetime.datetime.fromtimestamp(
+                self.protocol._send_time_second)),
+            second[52])
+
+    def test_send_with_empty_required_field(self):
+        """ A required field that is empty is reported as missing """
+        with self.assertRaises(FIXDataError) as context:
+            self.transport.send_message(FIXMessage(source=[(8, 'FIX.4.2')]))
+        self.assertEqual(35, context.exception.reference_id)
+        self.assertEqual(0, self.transport.message_sent_count)